@@ -0,0 +1,6 @@
+from datetime import datetime
+
+
+def parse_iso(s: str) -> datetime:
+    """Parse an ISO timestamp as a naive UTC datetime, tolerating a trailing "Z"."""
+    return datetime.fromisoformat(s[:-1] if s.endswith("Z") else s)
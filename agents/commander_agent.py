@@ -1,15 +1,43 @@
+import asyncio
+import functools
 import random
 from datetime import datetime, timedelta
 from pathlib import Path
 from pydantic_ai import Agent, RunContext
+from pydantic_ai.models.openrouter import OpenRouterModel
 from models import IncidentContext, RCAReport
+from triggers import METRIC_BASELINES
 
+_rng = random.Random()
 
+
+class _CachedSystemPromptModel(OpenRouterModel):
+    """OpenRouterModel that marks the system prompt as an Anthropic ephemeral cache breakpoint.
+
+    The commander's instructions and tool definitions are identical on every turn and
+    every incident, so Anthropic can serve them from its prompt cache instead of
+    re-processing them. OpenRouter forwards `cache_control` on content parts as-is.
+    """
+
+    async def _map_messages(self, messages, model_request_parameters):
+        openai_messages = await super()._map_messages(messages, model_request_parameters)
+        system_messages = [m for m in openai_messages if m.get("role") == "system"]
+        if system_messages and isinstance(system_messages[-1]["content"], str):
+            system_messages[-1]["content"] = [{
+                "type": "text",
+                "text": system_messages[-1]["content"],
+                "cache_control": {"type": "ephemeral"},
+            }]
+        return openai_messages
+
+
+@functools.lru_cache(maxsize=1)
 def _make_agent() -> Agent:
     agent = Agent(
-        model="openrouter:anthropic/claude-sonnet-4-5",
+        model=_CachedSystemPromptModel("anthropic/claude-sonnet-4-5"),
         output_type=RCAReport,
         deps_type=IncidentContext,
+        model_settings={"parallel_tool_calls": True},
         system_prompt=(
             "You are an incident commander. Given metrics anomalies and log summaries, "
             "investigate the incident using available tools to gather additional context "
@@ -30,15 +58,9 @@ def _make_agent() -> Agent:
     )
 
     @agent.tool
-    def get_metric_details(ctx: RunContext[IncidentContext], metric_name: str, start: str, end: str) -> dict:
+    async def get_metric_details(ctx: RunContext[IncidentContext], metric_name: str, start: str, end: str) -> dict:
         """Get detailed metric data for a specific metric in the given time window."""
-        base = {
-            "cpu_usage": 40.0,
-            "error_rate": 0.5,
-            "latency_p99": 120.0,
-            "checkout_latency_p99": 210.0,
-            "heap_usage_mb": 512.0,
-        }.get(metric_name, 50.0)
+        base = METRIC_BASELINES.get(metric_name, 50.0)
         if metric_name == "checkout_latency_p99":
             current_mean = 2050.0
         elif metric_name == "heap_usage_mb":
@@ -53,12 +75,12 @@ def _make_agent() -> Agent:
             "baseline_mean": round(baseline_mean, 4),
             "deviation_percent": round(((current_mean - baseline_mean) / baseline_mean) * 100, 2),
             "peak_value": round(current_mean * 1.2, 4),
-            "anomalous_points": random.randint(5, 15),
+            "anomalous_points": _rng.randint(5, 15),
             "trend": "gradual_ramp" if metric_name == "heap_usage_mb" else "sudden_spike",
         }
 
     @agent.tool
-    def get_log_details(ctx: RunContext[IncidentContext], service: str, start: str, end: str) -> dict:
+    async def get_log_details(ctx: RunContext[IncidentContext], service: str, start: str, end: str) -> dict:
         """Get log summary details for a service in the given time window."""
         if service == "worker-service":
             return {
@@ -99,14 +121,14 @@ def _make_agent() -> Agent:
         return {
             "service": service,
             "window": {"start": start, "end": end},
-            "error_count": random.randint(50, 300),
-            "warn_count": random.randint(10, 80),
-            "top_errors": random.sample(errors, k=min(3, len(errors))),
-            "error_rate_per_minute": round(random.uniform(5.0, 25.0), 2),
+            "error_count": _rng.randint(50, 300),
+            "warn_count": _rng.randint(10, 80),
+            "top_errors": _rng.sample(errors, k=min(3, len(errors))),
+            "error_rate_per_minute": round(_rng.uniform(5.0, 25.0), 2),
         }
 
     @agent.tool
-    def list_recent_deploys(ctx: RunContext[IncidentContext], start: str, end: str) -> list[dict]:
+    async def list_recent_deploys(ctx: RunContext[IncidentContext], start: str, end: str) -> list[dict]:
         """List recent deployment events between start and end ISO timestamps."""
         # The latent config bug: checkout-service-config deployed 15 minutes before the anomaly
         config_deploy_time = ctx.deps.triggered_at - timedelta(minutes=15)
@@ -125,8 +147,8 @@ def _make_agent() -> Agent:
             {
                 "service": "api-gateway",
                 "deploy_type": "service",
-                "commit_sha": f"a{random.randint(100000, 999999)}b",
-                "version": f"v3.{random.randint(1, 4)}.{random.randint(0, 10)}",
+                "commit_sha": f"a{_rng.randint(100000, 999999)}b",
+                "version": f"v3.{_rng.randint(1, 4)}.{_rng.randint(0, 10)}",
                 "deployed_at": (ctx.deps.triggered_at - timedelta(hours=4)).isoformat(),
                 "deployed_by": "ci-pipeline",
                 "status": "success",
@@ -136,7 +158,7 @@ def _make_agent() -> Agent:
         return deploys
 
     @agent.tool
-    def get_code_diff(ctx: RunContext[IncidentContext], service: str, commit_sha: str) -> dict:
+    async def get_code_diff(ctx: RunContext[IncidentContext], service: str, commit_sha: str) -> dict:
         """Get a mock code diff snippet for a service at a given commit SHA."""
         diffs = {
             "checkout-service": (
@@ -164,13 +186,13 @@ def _make_agent() -> Agent:
             "service": service,
             "commit_sha": commit_sha,
             "diff": diff,
-            "files_changed": random.randint(1, 5),
-            "lines_added": random.randint(5, 50),
-            "lines_removed": random.randint(5, 30),
+            "files_changed": _rng.randint(1, 5),
+            "lines_added": _rng.randint(5, 50),
+            "lines_removed": _rng.randint(5, 30),
         }
 
     @agent.tool
-    def write_rca(ctx: RunContext[IncidentContext], report: RCAReport) -> str:
+    async def write_rca(ctx: RunContext[IncidentContext], report: RCAReport) -> str:
         """Write the RCA report to a markdown file and return the file path."""
         rca_dir = Path("rca_reports")
         rca_dir.mkdir(exist_ok=True)
@@ -212,7 +234,7 @@ def _make_agent() -> Agent:
 
 *RCA generated by Incident Commander multi-agent system*
 """
-        filename.write_text(md)
+        await asyncio.to_thread(filename.write_bytes, md.encode("utf-8"))
         return str(filename)
 
     return agent
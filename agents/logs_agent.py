@@ -1,8 +1,13 @@
+import functools
+import heapq
 import random
 from datetime import datetime, timedelta
 from pydantic_ai import Agent
+from agents import parse_iso
 from models import LogSummary
 
+_rng = random.Random()
+
 MOCK_LOG_TEMPLATES = [
     "[ERROR] {service}: Connection timeout after 30s",
     "[WARN]  {service}: High memory usage detected (>85%)",
@@ -47,34 +52,45 @@ SERVICES = ["api-gateway", "auth-service", "payment-service", "checkout-service"
 DEPS = ["postgres", "redis", "kafka", "elasticsearch"]
 
 
+def _fmt_ts(ts: datetime) -> str:
+    """Format as YYYY-MM-DDTHH:MM:SSZ — cheaper than strftime for this fixed layout."""
+    return f"{ts.year:04d}-{ts.month:02d}-{ts.day:02d}T{ts.hour:02d}:{ts.minute:02d}:{ts.second:02d}Z"
+
+
 def _gen_logs(service: str, start_dt: datetime, end_dt: datetime, count: int = 20) -> list[str]:
-    logs = []
-    # Inject scenario-specific logs for known services
+    duration = (end_dt - start_dt).total_seconds()
+    # Scenario-specific logs for known services — offsets are monotone by construction
+    scenario_logs = []
     if service == "worker-service":
         for i, entry in enumerate(MEMORY_LEAK_LOGS):
             # spread evenly across the full window — leak is gradual
-            offset = (end_dt - start_dt).total_seconds() * (i / len(MEMORY_LEAK_LOGS))
+            offset = duration * (i / len(MEMORY_LEAK_LOGS))
             ts = start_dt + timedelta(seconds=offset)
-            logs.append(f"{ts.strftime('%Y-%m-%dT%H:%M:%SZ')} {entry}")
+            scenario_logs.append(f"{_fmt_ts(ts)} {entry}")
     if service == "checkout-service":
         for i, entry in enumerate(CHECKOUT_BUG_LOGS):
             # spread them across the second half of the window (after config deploy)
-            offset = (end_dt - start_dt).total_seconds() * (0.5 + i * 0.04)
-            ts = start_dt + timedelta(seconds=min(offset, (end_dt - start_dt).total_seconds() - 1))
-            logs.append(f"{ts.strftime('%Y-%m-%dT%H:%M:%SZ')} {entry}")
-    for _ in range(count):
-        offset = random.random() * (end_dt - start_dt).total_seconds()
-        ts = start_dt + timedelta(seconds=offset)
-        template = random.choice(MOCK_LOG_TEMPLATES)
-        line = template.format(
-            service=service,
-            dep=random.choice(DEPS),
-            version=f"v1.{random.randint(0, 9)}.{random.randint(0, 99)}",
-        )
-        logs.append(f"{ts.strftime('%Y-%m-%dT%H:%M:%SZ')} {line}")
-    return sorted(logs)
+            offset = duration * (0.5 + i * 0.04)
+            ts = start_dt + timedelta(seconds=min(offset, duration - 1))
+            scenario_logs.append(f"{_fmt_ts(ts)} {entry}")
+
+    # Sort the numeric offsets rather than the formatted lines, so the stream is ordered up front
+    offsets = sorted(_rng.random() * duration for _ in range(count))
+    templates = _rng.choices(MOCK_LOG_TEMPLATES, k=count)
+    deps = _rng.choices(DEPS, k=count)
+    versions = [
+        f"v1.{minor}.{patch}"
+        for minor, patch in zip(_rng.choices(range(10), k=count), _rng.choices(range(100), k=count))
+    ]
+    random_logs = [
+        f"{_fmt_ts(start_dt + timedelta(seconds=offset))} "
+        f"{template.format(service=service, dep=dep, version=version)}"
+        for offset, template, dep, version in zip(offsets, templates, deps, versions)
+    ]
+    return list(heapq.merge(scenario_logs, random_logs))
 
 
+@functools.lru_cache(maxsize=1)
 def _make_agent() -> Agent:
     agent = Agent(
         model="openrouter:anthropic/claude-sonnet-4-5",
@@ -89,8 +105,8 @@ def _make_agent() -> Agent:
     @agent.tool_plain
     def fetch_logs(service: str, start_iso: str, end_iso: str, level: str = "ERROR") -> list[str]:
         """Fetch mock log lines for a service between start_iso and end_iso filtered by level."""
-        start_dt = datetime.fromisoformat(start_iso.replace("Z", ""))
-        end_dt = datetime.fromisoformat(end_iso.replace("Z", ""))
+        start_dt = parse_iso(start_iso)
+        end_dt = parse_iso(end_iso)
         all_logs = _gen_logs(service, start_dt, end_dt, count=30)
         if level:
             return [l for l in all_logs if f"[{level}]" in l]
@@ -99,12 +115,13 @@ def _make_agent() -> Agent:
     @agent.tool_plain
     def search_logs(pattern: str, start_iso: str, end_iso: str) -> list[str]:
         """Search all services for log lines matching pattern between start_iso and end_iso."""
-        start_dt = datetime.fromisoformat(start_iso.replace("Z", ""))
-        end_dt = datetime.fromisoformat(end_iso.replace("Z", ""))
+        start_dt = parse_iso(start_iso)
+        end_dt = parse_iso(end_iso)
+        needle = pattern.lower()
         matches = []
         for svc in SERVICES:
             logs = _gen_logs(svc, start_dt, end_dt, count=15)
-            matches.extend([l for l in logs if pattern.lower() in l.lower()])
+            matches.extend([l for l in logs if needle in l.lower()])
         return matches[:20]
 
     return agent
@@ -1,9 +1,15 @@
+import functools
 import random
-from datetime import datetime, timedelta
+from datetime import timedelta
 from pydantic_ai import Agent
+from agents import parse_iso
 from models import MetricAnomaly
+from triggers import METRIC_BASELINES
 
+_rng = random.Random()
 
+
+@functools.lru_cache(maxsize=1)
 def _make_agent() -> Agent:
     agent = Agent(
         model="openrouter:anthropic/claude-sonnet-4-5",
@@ -19,23 +25,25 @@ def _make_agent() -> Agent:
     @agent.tool_plain
     def query_metric(metric_name: str, start: str, end: str) -> dict:
         """Query mock timeseries data for a metric between start and end ISO timestamps."""
-        start_dt = datetime.fromisoformat(start.replace("Z", ""))
-        end_dt = datetime.fromisoformat(end.replace("Z", ""))
-        base = {"cpu_usage": 40.0, "error_rate": 0.5, "latency_p99": 120.0}.get(metric_name, 50.0)
-        points = {}
-        current = start_dt
-        while current <= end_dt:
-            spike = base * 3 if current >= end_dt - timedelta(minutes=10) else 0.0
-            points[current.isoformat()] = round(base + random.gauss(0, base * 0.05) + spike, 4)
-            current += timedelta(minutes=1)
+        start_dt = parse_iso(start)
+        end_dt = parse_iso(end)
+        base = METRIC_BASELINES.get(metric_name, 50.0)
+        n_minutes = int((end_dt - start_dt).total_seconds() // 60) + 1
+        spike_start = end_dt - timedelta(minutes=10)
+        noise_scale = base * 0.05
+        gauss = _rng.gauss
+        points = {
+            ts.isoformat(): round(base + gauss(0, noise_scale) + (base * 3 if ts >= spike_start else 0.0), 4)
+            for ts in (start_dt + timedelta(minutes=i) for i in range(n_minutes))
+        }
         return {"metric": metric_name, "points": points}
 
     @agent.tool_plain
     def compare_baseline(metric_name: str, current_window: str, baseline_window: str) -> dict:
         """Compare current window metric values against a baseline window."""
-        base = {"cpu_usage": 40.0, "error_rate": 0.5, "latency_p99": 120.0}.get(metric_name, 50.0)
-        current_mean = base * 3.2 + random.gauss(0, base * 0.1)
-        baseline_mean = base + random.gauss(0, base * 0.05)
+        base = METRIC_BASELINES.get(metric_name, 50.0)
+        current_mean = base * 3.2 + _rng.gauss(0, base * 0.1)
+        baseline_mean = base + _rng.gauss(0, base * 0.05)
         deviation_pct = round(((current_mean - baseline_mean) / baseline_mean) * 100, 2)
         return {
             "metric": metric_name,
@@ -1,30 +1,27 @@
 import asyncio
 import os
-import subprocess
 from datetime import datetime, timedelta
 
 from triggers import detect_anomalies
-from agents.metrics_agent import run_metrics_agent
-from agents.logs_agent import run_logs_agent
-from agents.commander_agent import run_commander_agent
-from models import IncidentContext
+from models import IncidentContext, MetricAnomaly
 
 ARTIFACTS_GCS_DIR = os.environ.get("ARTIFACTS_GCS_DIR", "")
 
 
-def upload_to_gcs(local_path: str) -> None:
+async def upload_to_gcs(local_path: str) -> None:
     if not ARTIFACTS_GCS_DIR:
         print("      ARTIFACTS_GCS_DIR not set — skipping GCS upload.")
         return
     dest = f"{ARTIFACTS_GCS_DIR.rstrip('/')}/{os.path.basename(local_path)}"
     print(f"      Uploading {local_path} → {dest}")
-    result = subprocess.run(
-        ["gsutil", "cp", local_path, dest],
-        capture_output=True,
-        text=True,
+    proc = await asyncio.create_subprocess_exec(
+        "gsutil", "cp", local_path, dest,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
     )
-    if result.returncode != 0:
-        print(f"      GCS upload failed: {result.stderr.strip()}")
+    _, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        print(f"      GCS upload failed: {stderr.decode().strip()}")
     else:
         print(f"      Uploaded: {dest}")
 
@@ -42,16 +39,28 @@ async def main():
     for a in anomalies:
         print(f"      - {a.metric_name}: {a.value:.2f} (threshold: {a.threshold:.2f})")
 
+    await investigate(anomalies)
+
+
+async def investigate(anomalies: list[MetricAnomaly]) -> None:
+    # Imported only once there is an incident — pydantic-ai's import graph dominates
+    # cold start, and the healthy path in main() never needs it.
+    from agents.metrics_agent import run_metrics_agent
+    from agents.logs_agent import run_logs_agent
+    from agents.commander_agent import run_commander_agent
+
     triggered_at = max(a.timestamp for a in anomalies)
     window_start = (triggered_at - timedelta(minutes=30)).isoformat()
     window_end = triggered_at.isoformat()
 
+    # MetricsAgent and LogsAgent are independent — only the commander consumes both
     print("\n[2/4] Running MetricsAgent...")
-    metrics_summary = await run_metrics_agent(anomalies)
+    print("[3/4] Running LogsAgent...")
+    metrics_summary, log_summary = await asyncio.gather(
+        run_metrics_agent(anomalies),
+        run_logs_agent(window_start, window_end),
+    )
     print(f"      MetricsAgent summary: {metrics_summary[:120]}...")
-
-    print("\n[3/4] Running LogsAgent...")
-    log_summary = await run_logs_agent(window_start, window_end)
     print(f"      LogsAgent summary: {log_summary.summary[:120]}...")
 
     print("\n[4/4] Running CommanderAgent (INVESTIGATE → DECIDE → ACT → REPORT)...")
@@ -69,7 +78,7 @@ async def main():
     print(f"Confidence: {rca.confidence * 100:.0f}%")
     print(f"Affected services: {', '.join(rca.affected_services)}")
 
-    upload_to_gcs(local_rca_path)
+    await upload_to_gcs(local_rca_path)
 
 
 if __name__ == "__main__":
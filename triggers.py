@@ -1,37 +1,44 @@
-import random
 import math
+import random
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from models import MetricAnomaly
 
+# Mock-data generator; seed with `_rng.seed(...)` for reproducible runs
+_rng = random.Random()
+
+# Normal operating level per metric; unknown metrics fall back to 50.0
+METRIC_BASELINES = MappingProxyType({
+    "cpu_usage": 40.0,
+    "error_rate": 0.5,
+    "latency_p99": 120.0,
+    "checkout_latency_p99": 210.0,  # normal ~210ms
+    "heap_usage_mb": 512.0,         # normal heap ~512 MB
+})
+
 
 def generate_mock_timeseries(metric_name: str, n: int = 100) -> list[tuple[datetime, float]]:
     """Generate mock timeseries with an injected spike near the end."""
     now = datetime.utcnow()
-    base = {
-        "cpu_usage": 40.0,
-        "error_rate": 0.5,
-        "latency_p99": 120.0,
-        "checkout_latency_p99": 210.0,  # normal ~210ms
-        "heap_usage_mb": 512.0,         # normal heap ~512 MB
-    }.get(metric_name, 50.0)
+    base = METRIC_BASELINES.get(metric_name, 50.0)
     noise_scale = base * 0.05
 
-    series = []
-    for i in range(n):
-        ts = now - timedelta(seconds=(n - i) * 60)
-        noise = random.gauss(0, noise_scale)
-        if metric_name == "checkout_latency_p99":
-            # sudden spike to ~2000ms
-            spike = 1800.0 if i >= int(n * 0.9) else 0.0
-        elif metric_name == "heap_usage_mb":
-            # gradual linear ramp — classic memory leak signature
-            # climbs from base (512 MB) to ~1800 MB over the full window
-            spike = (i / n) * 1300.0
-        else:
-            spike = base * 3 if i >= int(n * 0.9) else 0.0
-        series.append((ts, base + noise + spike))
+    spike_start = int(n * 0.9)
+    if metric_name == "checkout_latency_p99":
+        # sudden spike to ~2000ms
+        spikes = [0.0] * spike_start + [1800.0] * (n - spike_start)
+    elif metric_name == "heap_usage_mb":
+        # gradual linear ramp — classic memory leak signature
+        # climbs from base (512 MB) to ~1800 MB over the full window
+        spikes = [(i / n) * 1300.0 for i in range(n)]
+    else:
+        spikes = [0.0] * spike_start + [base * 3] * (n - spike_start)
 
-    return series
+    gauss = _rng.gauss
+    return [
+        (now - timedelta(seconds=(n - i) * 60), base + gauss(0, noise_scale) + spike)
+        for i, spike in enumerate(spikes)
+    ]
 
 
 class WindowTrigger:
@@ -49,18 +56,21 @@ class WindowTrigger:
         variance = sum((v - mean) ** 2 for v in values) / n
         std = math.sqrt(variance)
         threshold = mean + self.threshold_multiplier * std
+        # Healthy path: nothing above threshold, skip building the anomaly list
+        if max(values) <= threshold:
+            return []
 
-        anomalies = []
-        for ts, val in series:
-            if val > threshold:
-                anomalies.append(MetricAnomaly(
-                    metric_name=metric_name,
-                    value=round(val, 4),
-                    threshold=round(threshold, 4),
-                    timestamp=ts,
-                    window_seconds=self.window_seconds,
-                ))
-        return anomalies
+        return [
+            MetricAnomaly(
+                metric_name=metric_name,
+                value=round(val, 4),
+                threshold=round(threshold, 4),
+                timestamp=ts,
+                window_seconds=self.window_seconds,
+            )
+            for ts, val in series
+            if val > threshold
+        ]
 
 
 def detect_anomalies() -> list[MetricAnomaly]: